@@ -1,79 +1,412 @@
 import ctypes
 import sys
 import os
+import re
 import subprocess # Added for running PowerShell to get adapters
-import json       # Added for parsing PowerShell output
+import csv        # Added for parsing PowerShell output
+import threading
+import json       # Added for the on-disk adapter cache
+import argparse
+import winreg
 
 # --- Configuration ---
 TARGET_PS_SCRIPT_NAME = "GamingNetworkOptimization.ps1"
+ADAPTER_CACHE_FILE_NAME = "gno_adapters.json" # Stored in %LOCALAPPDATA%
+POWERSHELL_QUERY_TIMEOUT_SECONDS = 60
+# Network adapter class key; its direct subkeys are the adapter GUIDs
+NETWORK_ADAPTERS_REG_KEY = r"SYSTEM\CurrentControlSet\Control\Network\{4D36E972-E325-11CE-BFC1-08002BE10318}"
+# Network adapter driver class key; its numbered subkeys hold each adapter's DriverDesc (InterfaceDescription)
+NETWORK_ADAPTER_DRIVERS_REG_KEY = r"SYSTEM\CurrentControlSet\Control\Class\{4D36E972-E325-11CE-BFC1-08002BE10318}"
+# Adapter descriptions containing any of these are treated as virtual (not auto-selected)
+VIRTUAL_ADAPTER_KEYWORDS = ('virtual', 'wan miniport', 'loopback', 'vpn', 'wiresock', 'tap', 'tun')
+# All keywords in one pattern, so each description is scanned once instead of once per keyword
+VIRTUAL_ADAPTER_PATTERN = re.compile('|'.join(map(re.escape, VIRTUAL_ADAPTER_KEYWORDS)), re.IGNORECASE)
 
-def get_network_adapters_from_powershell():
+# --- Error reporting ---
+MB_OK = 0x0
+MB_ICONERROR = 0x10
+ADAPTER_ERROR_TITLE = "Adapter Enumeration Error"
+
+# Resolved once at import instead of going through ctypes.windll.user32 at every error site
+user32 = ctypes.WinDLL('user32', use_last_error=True)
+MessageBoxW = user32.MessageBoxW
+MessageBoxW.argtypes = [ctypes.c_void_p, ctypes.c_wchar_p, ctypes.c_wchar_p, ctypes.c_uint]
+MessageBoxW.restype = ctypes.c_int
+
+def show_error(title, message):
     """
-    Uses PowerShell to get a list of network adapters with their details.
+    Prints the error message and shows it in an error message box.
+    """
+    print(message)
+    MessageBoxW(None, message, title, MB_ICONERROR | MB_OK)
+
+# --- IP Helper API (iphlpapi.dll) definitions for GetAdaptersAddresses ---
+AF_UNSPEC = 0
+# Skip the address lists we never read: unicast, anycast, multicast and DNS server addresses
+GAA_FLAG_SKIP_ADDRESSES = 0x0001 | 0x0002 | 0x0004 | 0x0008
+ERROR_SUCCESS = 0
+ERROR_NO_DATA = 232
+ERROR_BUFFER_OVERFLOW = 111
+IF_TYPE_SOFTWARE_LOOPBACK = 24
+IF_TYPE_TUNNEL = 131
+
+class IP_ADAPTER_ADDRESSES(ctypes.Structure):
+    pass
+
+# Only the leading fields we need are declared; the list is walked through pointers into the
+# buffer filled by the OS, so the remainder of the native structure can be left out.
+IP_ADAPTER_ADDRESSES._fields_ = [
+    ("Length", ctypes.c_ulong),
+    ("IfIndex", ctypes.c_ulong),
+    ("Next", ctypes.POINTER(IP_ADAPTER_ADDRESSES)),
+    ("AdapterName", ctypes.c_char_p),
+    ("FirstUnicastAddress", ctypes.c_void_p),
+    ("FirstAnycastAddress", ctypes.c_void_p),
+    ("FirstMulticastAddress", ctypes.c_void_p),
+    ("FirstDnsServerAddress", ctypes.c_void_p),
+    ("DnsSuffix", ctypes.c_wchar_p),
+    ("Description", ctypes.c_wchar_p),
+    ("FriendlyName", ctypes.c_wchar_p),
+    ("PhysicalAddress", ctypes.c_ubyte * 8),
+    ("PhysicalAddressLength", ctypes.c_ulong),
+    ("Flags", ctypes.c_ulong),
+    ("Mtu", ctypes.c_ulong),
+    ("IfType", ctypes.c_ulong),
+]
+
+def get_network_adapters_via_winapi():
+    """
+    Uses the IP Helper API (GetAdaptersAddresses) to get a list of network adapters with their details.
+    Returns dicts shaped like the PowerShell output (Name, InterfaceDescription, InterfaceGuid).
+    Raises OSError if the API is unavailable or the call fails.
+    """
+    iphlpapi = ctypes.WinDLL('Iphlpapi')
+    get_adapters_addresses = iphlpapi.GetAdaptersAddresses
+    get_adapters_addresses.argtypes = [
+        ctypes.c_ulong, ctypes.c_ulong, ctypes.c_void_p,
+        ctypes.c_void_p, ctypes.POINTER(ctypes.c_ulong)
+    ]
+    get_adapters_addresses.restype = ctypes.c_ulong
+
+    # Two-call idiom: the first call reports the required buffer size. The adapter list can grow
+    # between calls, so retry a few times while the OS still reports an overflow.
+    size = ctypes.c_ulong(0)
+    buffer = None
+    ret = get_adapters_addresses(AF_UNSPEC, GAA_FLAG_SKIP_ADDRESSES, None, None, ctypes.byref(size))
+    for _ in range(3):
+        if ret != ERROR_BUFFER_OVERFLOW:
+            break
+        buffer = ctypes.create_string_buffer(size.value)
+        ret = get_adapters_addresses(AF_UNSPEC, GAA_FLAG_SKIP_ADDRESSES, None, buffer, ctypes.byref(size))
+
+    if ret == ERROR_NO_DATA:
+        return []
+    if ret != ERROR_SUCCESS or buffer is None:
+        raise ctypes.WinError(ret)
+
+    adapters = []
+    entry = ctypes.cast(buffer, ctypes.POINTER(IP_ADAPTER_ADDRESSES))
+    while entry:
+        adapter = entry.contents
+        # Get-NetAdapter does not list the loopback or tunnel pseudo-interfaces either
+        if adapter.IfType not in (IF_TYPE_SOFTWARE_LOOPBACK, IF_TYPE_TUNNEL) and adapter.AdapterName:
+            guid = adapter.AdapterName.decode('ascii')
+            if not guid.startswith('{'):
+                guid = '{' + guid + '}'
+            adapters.append({
+                'Name': adapter.FriendlyName,
+                'InterfaceDescription': adapter.Description,
+                'InterfaceGuid': guid,
+            })
+        entry = adapter.Next
+    return adapters
+
+def start_powershell_adapter_query():
+    """
+    Starts the PowerShell adapter query without waiting for it to finish, so it can run while
+    the launcher does other work. Returns the running process.
     This part does NOT require admin rights.
     """
-    print("Fetching available network adapters...")
-    # Command to get adapter info as JSON, filtering out those without a GUID
-    command = "Get-NetAdapter | Select-Object Name, InterfaceDescription, InterfaceGuid | Where-Object {$_.InterfaceGuid -ne $null} | ConvertTo-Json -Compress"
+    # Command to get adapter info as CSV, querying only the needed CIM properties and
+    # filtering out hidden adapters (as Get-NetAdapter does) and those without a GUID
+    command = (
+        "Get-CimInstance -Namespace root/StandardCimv2 -ClassName MSFT_NetAdapter "
+        "-Property Name,InterfaceDescription,InterfaceGuid,Hidden "
+        "| Where-Object {$_.InterfaceGuid -and -not $_.Hidden} "
+        "| Select-Object Name, InterfaceDescription, InterfaceGuid "
+        "| ConvertTo-Csv -NoTypeInformation"
+    )
+    # Run PowerShell command, hide its window for this data retrieval step
+    return subprocess.Popen(
+        ["powershell.exe", "-NoProfile", "-Command", command],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8',
+        creationflags=subprocess.CREATE_NO_WINDOW
+    )
+
+def get_network_adapters_from_powershell(process=None):
+    """
+    Uses PowerShell to get a list of network adapters with their details.
+    Waits for an already started query if one is given, otherwise starts one.
+    """
+    reader = None
+    timed_out = threading.Event()
     try:
-        # Run PowerShell command, hide its window for this data retrieval step
-        process = subprocess.run(
-            ["powershell.exe", "-NoProfile", "-Command", command],
-            capture_output=True, text=True, check=True, encoding='utf-8',
-            creationflags=subprocess.CREATE_NO_WINDOW 
-        )
-        adapters_json = process.stdout
-        adapters_data = json.loads(adapters_json)
-        # If PowerShell returns a single adapter, ConvertTo-Json might output a single object instead of an array
-        if isinstance(adapters_data, dict):
-            return [adapters_data] # Ensure it's always a list
-        return adapters_data
+        if process is None:
+            process = start_powershell_adapter_query()
+
+        def kill_on_timeout():
+            timed_out.set()
+            process.kill() # Also closes stdout, which ends the read loop below
+
+        # Drain stderr on its own thread while stdout is parsed; otherwise PowerShell can block writing
+        # error or progress records to a full stderr pipe while this thread waits on stdout
+        stderr_chunks = []
+        stderr_reader = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)
+        stderr_reader.start()
+
+        watchdog = threading.Timer(POWERSHELL_QUERY_TIMEOUT_SECONDS, kill_on_timeout)
+        watchdog.start()
+        try:
+            # Parse rows straight from the pipe as PowerShell writes them, so the whole output is never
+            # buffered as one string. Each row maps the selected columns to their values.
+            # The selection menu needs len() and indexing, so the rows are collected into a list.
+            reader = csv.DictReader(process.stdout)
+            adapters = list(reader)
+            process.wait()
+            stderr_reader.join()
+        finally:
+            watchdog.cancel()
+        stderr = ''.join(stderr_chunks)
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(process.args, POWERSHELL_QUERY_TIMEOUT_SECONDS)
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, process.args, stderr=stderr)
+        return adapters
+    except subprocess.TimeoutExpired:
+        error_msg = f"PowerShell did not return the adapter list within {POWERSHELL_QUERY_TIMEOUT_SECONDS} seconds."
+        show_error(ADAPTER_ERROR_TITLE, error_msg)
+        return None
     except subprocess.CalledProcessError as e:
         error_msg = f"Error getting network adapters from PowerShell: {e}\nStderr: {e.stderr}"
-        print(error_msg)
-        ctypes.windll.user32.MessageBoxW(None, error_msg, "Adapter Enumeration Error", 0x10 | 0x0)
+        show_error(ADAPTER_ERROR_TITLE, error_msg)
         return None
-    except json.JSONDecodeError as e:
-        error_msg = f"Error decoding JSON from PowerShell adapter list: {e}\nRaw output: {process.stdout if 'process' in locals() else 'N/A'}"
-        print(error_msg)
-        ctypes.windll.user32.MessageBoxW(None, error_msg, "Adapter Enumeration Error", 0x10 | 0x0)
+    except csv.Error as e:
+        error_msg = f"Error parsing CSV from PowerShell adapter list (line {reader.line_num if reader else 'N/A'}): {e}"
+        show_error(ADAPTER_ERROR_TITLE, error_msg)
         return None
     except Exception as e:
         error_msg = f"An unexpected error occurred while getting adapters: {e}"
-        print(error_msg)
-        ctypes.windll.user32.MessageBoxW(None, error_msg, "Adapter Enumeration Error", 0x10 | 0x0)
+        show_error(ADAPTER_ERROR_TITLE, error_msg)
+        return None
+    finally:
+        # On any error before PowerShell exited (malformed CSV, decode errors, ...), stop and reap it
+        if process is not None and process.poll() is None:
+            process.kill()
+            process.wait()
+
+def get_adapter_cache_path():
+    """
+    Returns the path of the adapter cache file, or None if %LOCALAPPDATA% is not set.
+    """
+    local_app_data = os.environ.get('LOCALAPPDATA')
+    if not local_app_data:
+        return None
+    return os.path.join(local_app_data, ADAPTER_CACHE_FILE_NAME)
+
+def get_adapter_config_timestamp():
+    """
+    Returns the most recent registry write time (as a Unix timestamp) of the network adapter class key
+    and each adapter's 'Connection' subkey, which holds its name, and of the driver class key and each
+    adapter's driver subkey, which holds its description. Adding, removing or renaming an adapter, or a
+    driver update changing its description, moves this forward. Returns None if the registry cannot be read.
+    """
+    # QueryInfoKey reports last-write times in 100ns intervals since 1601-01-01
+    def to_unix_time(filetime):
+        return filetime / 10_000_000 - 11644473600
+
+    # (class key, path below each of its subkeys whose write time is also checked)
+    fingerprint_keys = (
+        (NETWORK_ADAPTERS_REG_KEY, r"\Connection"),
+        (NETWORK_ADAPTER_DRIVERS_REG_KEY, ""),
+    )
+    try:
+        newest = 0
+        for class_key_path, subkey_suffix in fingerprint_keys:
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, class_key_path) as class_key:
+                subkey_count, _, last_modified = winreg.QueryInfoKey(class_key)
+                newest = max(newest, last_modified)
+                for i in range(subkey_count):
+                    subkey_name = winreg.EnumKey(class_key, i)
+                    try:
+                        with winreg.OpenKey(class_key, subkey_name + subkey_suffix) as subkey:
+                            newest = max(newest, winreg.QueryInfoKey(subkey)[2])
+                    except OSError:
+                        continue # e.g. 'Descriptions' has no Connection key; 'Properties' is not readable
+        return to_unix_time(newest)
+    except OSError:
         return None
 
-def select_guids_for_tweaks(adapters):
+def load_cached_adapters():
+    """
+    Returns the cached adapter list if the cache file is newer than the last adapter configuration change.
+    Returns None if there is no usable cache.
+    """
+    cache_path = get_adapter_cache_path()
+    config_timestamp = get_adapter_config_timestamp()
+    if cache_path is None or config_timestamp is None:
+        return None
+    try:
+        if os.path.getmtime(cache_path) < config_timestamp:
+            return None # Adapters changed since the cache was written
+        with open(cache_path, 'r', encoding='utf-8') as cache_file:
+            adapters = json.load(cache_file)
+        return adapters if isinstance(adapters, list) else None
+    except (OSError, ValueError):
+        return None
+
+def save_adapter_cache(adapters):
+    """
+    Writes the adapter list to the cache file. The file is replaced atomically so a concurrent or
+    interrupted run never reads a partial cache. Failures are reported but not fatal.
+    """
+    cache_path = get_adapter_cache_path()
+    if cache_path is None:
+        return
+    temp_path = cache_path + ".tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as cache_file:
+            json.dump(adapters, cache_file)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: Could not write adapter cache '{cache_path}': {e}")
+
+def start_network_adapter_enumeration(use_cache=True):
+    """
+    Starts getting the list of network adapters, preferring the native IP Helper API.
+    Falls back to the cached adapter list, then to PowerShell, only if the native call fails.
+    Returns the adapter list if it is available right away, otherwise the still-running
+    PowerShell query, to be passed to finish_network_adapter_enumeration().
+    """
+    print("Fetching available network adapters...")
+    try:
+        return get_network_adapters_via_winapi()
+    except OSError as e:
+        print(f"Native adapter enumeration failed ({e}); falling back to PowerShell.")
+
+    if use_cache:
+        adapters = load_cached_adapters()
+        if adapters is not None:
+            print("Using cached adapter list (adapter configuration unchanged since last run).")
+            return adapters
+
+    try:
+        return start_powershell_adapter_query()
+    except OSError as e:
+        error_msg = f"Could not start PowerShell to get network adapters: {e}"
+        show_error(ADAPTER_ERROR_TITLE, error_msg)
+        return None
+
+def finish_network_adapter_enumeration(pending):
+    """
+    Returns the adapter list for the result of start_network_adapter_enumeration(),
+    waiting for the PowerShell query (and caching its output) if one was started.
+    Returns None if an error occurred.
+    """
+    if not isinstance(pending, subprocess.Popen):
+        return pending
+    adapters = get_network_adapters_from_powershell(pending)
+    if adapters is not None:
+        save_adapter_cache(adapters)
+    return adapters
+
+def get_physical_adapters(adapters):
+    """
+    Returns the adapters whose description does not look like a virtual adapter (VPN, Hyper-V, TAP, etc.).
+    """
+    return [
+        adapter for adapter in adapters
+        if not VIRTUAL_ADAPTER_PATTERN.search(adapter.get('InterfaceDescription') or '')
+    ]
+
+def select_guids_for_tweaks(adapters, auto=False):
     """
     Prompts the user to select one or more adapters from the provided list.
+    If only one physical adapter is present, the user is offered it first: Enter accepts it, while an
+    adapter number or 'skip' continues with the normal selection.
+    With auto=True, nothing is shown or asked: the only physical adapter is selected if there is exactly
+    one, otherwise interface-specific tweaks are skipped.
     Returns a list of selected GUID strings.
     """
     if not adapters:
         print("No network adapters with GUIDs were found or an error occurred.")
         return []
 
-    print("\nAvailable Network Adapters (select for interface-specific tweaks):")
-    for i, adapter in enumerate(adapters):
-        name = adapter.get('Name', 'N/A')
-        desc = adapter.get('InterfaceDescription', 'N/A')
-        guid = adapter.get('InterfaceGuid', 'N/A')
-        print(f"  {i+1}: {name} - {desc} (GUID: {guid})")
+    physical_adapters = get_physical_adapters(adapters)
+    if auto: # Unattended: no menu and no prompts
+        if len(physical_adapters) == 1:
+            only_adapter = physical_adapters[0]
+            print(f"\nAuto-selected the only physical adapter: '{only_adapter['Name']}' - {only_adapter['InterfaceGuid']}")
+            return [only_adapter['InterfaceGuid']]
+        print(
+            f"\n--auto: found {len(physical_adapters)} physical adapters, not exactly one; "
+            "skipping interface-specific tweaks. Run without --auto to choose adapters manually."
+        )
+        return []
+
+    # Build the whole menu first and write it in one call rather than one print per adapter
+    menu_lines = ["\nAvailable Network Adapters (select for interface-specific tweaks):"]
+    menu_lines.extend(
+        f"  {i+1}: {adapter.get('Name', 'N/A')} - {adapter.get('InterfaceDescription', 'N/A')} (GUID: {adapter.get('InterfaceGuid', 'N/A')})"
+        for i, adapter in enumerate(adapters)
+    )
+    menu_lines.append(
+        "\n--- Adapter Selection ---\n"
+        "You can apply interface-specific TCP tweaks (like disabling Nagle, immediate ACKs) to one or more adapters.\n"
+        "It's generally recommended for your primary physical gaming adapters (Ethernet, Wi-Fi).\n"
+        "It's generally NOT recommended for virtual adapters (like VPNs, e.g., WireSock) unless you're sure."
+    )
+    sys.stdout.write("\n".join(menu_lines) + "\n")
+
+    stdin_is_console = sys.stdin.isatty()
+    # Answers not consumed yet: further words of a line read from non-console stdin, or words typed at the
+    # confirmation prompt below. A line such as '1 3 done' thus answers several prompts at once.
+    queued_choices = []
 
-    print("\n--- Adapter Selection ---")
-    print("You can apply interface-specific TCP tweaks (like disabling Nagle, immediate ACKs) to one or more adapters.")
-    print("It's generally recommended for your primary physical gaming adapters (Ethernet, Wi-Fi).")
-    print("It's generally NOT recommended for virtual adapters (like VPNs, e.g., WireSock) unless you're sure.")
+    def read_choice(prompt):
+        if stdin_is_console and not queued_choices:
+            return input(prompt).strip().lower()
+        if not stdin_is_console:
+            # Pipes, but also terminals like mintty or IDE run windows where a user may be typing:
+            # show the prompt (and the menu before it) before blocking on the next line
+            sys.stdout.write(prompt)
+            sys.stdout.flush()
+        while not queued_choices:
+            line = sys.stdin.readline()
+            if not line:
+                return 'done' # End of input acts like 'done'
+            queued_choices.extend(line.split())
+        return queued_choices.pop(0).lower()
+
+    # Piped input is left to the normal prompts, so scripted answers are never reinterpreted
+    if len(physical_adapters) == 1 and stdin_is_console:
+        only_adapter = physical_adapters[0]
+        answer = input(
+            f"\nOnly one physical adapter was found: '{only_adapter['Name']}' - {only_adapter['InterfaceGuid']}\n"
+            "Press Enter to apply interface-specific tweaks to it, or type an adapter number or 'skip' to choose yourself: "
+        ).strip().lower()
+        if not answer:
+            print(f"  Added: '{only_adapter['Name']}' - {only_adapter['InterfaceGuid']}")
+            return [only_adapter['InterfaceGuid']]
+        queued_choices.extend(answer.split())
 
     selected_guids = []
+    selected_set = set() # Mirrors selected_guids for constant-time duplicate checks
+    # The prompt only changes when an adapter is added, so it is rebuilt there instead of on every iteration
+    prompt_message = "\nEnter the number of the adapter you want to apply interface-specific tweaks to (or type 'skip' to not apply to any specific interface): "
     while True:
         try:
-            if not selected_guids:
-                prompt_message = "\nEnter the number of the adapter you want to apply interface-specific tweaks to (or type 'skip' to not apply to any specific interface): "
-            else:
-                prompt_message = f"\nSelected GUIDs: {', '.join(selected_guids)}\nEnter the number of another adapter, or type 'done' if finished: "
-            
-            choice_str = input(prompt_message).strip().lower()
+            choice_str = read_choice(prompt_message)
 
             if choice_str == 'done':
                 if selected_guids:
@@ -89,8 +422,10 @@ def select_guids_for_tweaks(adapters):
             if 1 <= choice_num <= len(adapters):
                 chosen_adapter = adapters[choice_num - 1]
                 chosen_guid = chosen_adapter['InterfaceGuid']
-                if chosen_guid not in selected_guids:
+                if chosen_guid not in selected_set:
                     selected_guids.append(chosen_guid)
+                    selected_set.add(chosen_guid)
+                    prompt_message = f"\nSelected GUIDs: {', '.join(selected_guids)}\nEnter the number of another adapter, or type 'done' if finished: "
                     print(f"  Added: '{chosen_adapter['Name']}' - {chosen_guid}")
                 else:
                     print(f"  Adapter '{chosen_adapter['Name']}' already selected.")
@@ -100,7 +435,7 @@ def select_guids_for_tweaks(adapters):
                     break
                 
                 if not selected_guids: # If first selection, ask to add more immediately
-                     add_more_choice = input("  Do you want to add another adapter? (yes/no): ").strip().lower()
+                     add_more_choice = read_choice("  Do you want to add another adapter? (yes/no): ")
                      if add_more_choice not in ['yes', 'y']:
                         break
             else:
@@ -110,7 +445,60 @@ def select_guids_for_tweaks(adapters):
             
     return selected_guids
 
-def run_script():
+# --- Shell API (shell32.dll) definitions for ShellExecuteExW ---
+SEE_MASK_NOCLOSEPROCESS = 0x00000040 # Return a handle to the started process in hProcess
+SW_SHOWNORMAL = 1
+INFINITE = 0xFFFFFFFF
+# Explanations for the common GetLastError codes after a failed ShellExecuteExW; others use the system message
+SHELL_EXECUTE_ERRORS = {
+    2: "File not found (powershell.exe or script path issue).",
+    3: "Path not found.",
+    5: "Access denied (UAC prompt possibly denied or other permission issue).",
+    8: "The operating system is out of memory or resources.",
+    1223: "The operation was canceled by the user (UAC prompt denied or closed).", # Common UAC denial
+}
+
+class SHELLEXECUTEINFOW(ctypes.Structure):
+    _fields_ = [
+        ("cbSize", ctypes.c_ulong),
+        ("fMask", ctypes.c_ulong),
+        ("hwnd", ctypes.c_void_p),
+        ("lpVerb", ctypes.c_wchar_p),
+        ("lpFile", ctypes.c_wchar_p),
+        ("lpParameters", ctypes.c_wchar_p),
+        ("lpDirectory", ctypes.c_wchar_p),
+        ("nShow", ctypes.c_int),
+        ("hInstApp", ctypes.c_void_p),
+        ("lpIDList", ctypes.c_void_p),
+        ("lpClass", ctypes.c_wchar_p),
+        ("hkeyClass", ctypes.c_void_p),
+        ("dwHotKey", ctypes.c_ulong),
+        ("hIconOrMonitor", ctypes.c_void_p),
+        ("hProcess", ctypes.c_void_p),
+    ]
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description=f"Selects network adapters and launches '{TARGET_PS_SCRIPT_NAME}' as administrator."
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Ignore the cached adapter list and query the adapters again."
+    )
+    parser.add_argument(
+        "--auto", action="store_true",
+        help="Never prompt (for unattended use): select the only physical adapter if there is exactly one, otherwise skip interface-specific tweaks."
+    )
+    parser.add_argument(
+        "--wait", action="store_true",
+        help="Wait for the elevated PowerShell script to exit and report its exit code."
+    )
+    return parser.parse_args()
+
+def run_script(use_cache=True, wait=False, auto=False):
+    # Start fetching adapters first; a PowerShell fallback query keeps running while the checks below are done
+    pending_adapters = start_network_adapter_enumeration(use_cache=use_cache)
+
     # Determine the directory of the current Python script
     try:
         current_script_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
@@ -127,17 +515,18 @@ def run_script():
             f"Looked in directory: '{current_script_dir}'\n\n"
             f"Please ensure '{TARGET_PS_SCRIPT_NAME}' is in the same folder as this Python script."
         )
-        ctypes.windll.user32.MessageBoxW(None, message, "Script Not Found", 0x10 | 0x0) 
-        print(message) 
+        show_error("Script Not Found", message)
+        if isinstance(pending_adapters, subprocess.Popen):
+            pending_adapters.kill() # Adapter list is no longer needed
         return 
 
     # --- New: Get adapters and select GUIDs ---
-    adapters = get_network_adapters_from_powershell()
+    adapters = finish_network_adapter_enumeration(pending_adapters)
     if adapters is None: # Error occurred during adapter fetching
         print("Could not retrieve adapter list. Aborting launch of optimization script.")
         return
         
-    selected_guids = select_guids_for_tweaks(adapters)
+    selected_guids = select_guids_for_tweaks(adapters, auto=auto)
     guids_csv_for_ps = ",".join(selected_guids) # Create a comma-separated string of GUIDs
 
     print(f"\nAttempting to run '{target_ps_script_path}' as administrator...")
@@ -148,40 +537,63 @@ def run_script():
 
     executable_to_run = "powershell.exe"
     # Pass the selected GUIDs CSV string as a parameter to the PowerShell script
-    script_parameters = f'-NoProfile -ExecutionPolicy Bypass -File "{target_ps_script_path}" -TargetGuidsCsv "{guids_csv_for_ps}"'
+    script_arguments = [
+        "-NoProfile", "-ExecutionPolicy", "Bypass", "-File", target_ps_script_path,
+        "-TargetGuidsCsv", guids_csv_for_ps,
+    ]
+    # list2cmdline quotes each argument so powershell.exe (CommandLineToArgvW) splits them back unchanged
+    script_parameters = subprocess.list2cmdline(script_arguments)
 
     try:
-        ret = ctypes.windll.shell32.ShellExecuteW(
-            None, "runas", executable_to_run, script_parameters, None, 1
-        )
+        shell32 = ctypes.WinDLL('shell32', use_last_error=True)
+        shell_execute_ex = shell32.ShellExecuteExW
+        shell_execute_ex.argtypes = [ctypes.POINTER(SHELLEXECUTEINFOW)]
+        shell_execute_ex.restype = ctypes.c_int
+
+        execute_info = SHELLEXECUTEINFOW()
+        execute_info.cbSize = ctypes.sizeof(SHELLEXECUTEINFOW)
+        execute_info.fMask = SEE_MASK_NOCLOSEPROCESS
+        execute_info.lpVerb = "runas"
+        execute_info.lpFile = executable_to_run
+        execute_info.lpParameters = script_parameters
+        execute_info.nShow = SW_SHOWNORMAL
 
-        if ret <= 32:
-            error_message = f"ShellExecuteW failed to start the script. Error code: {ret}\n\n"
-            # ... (keep your existing detailed error code messages) ...
-            if ret == 0: error_message += "The operating system is out of memory or resources."
-            elif ret == 2: error_message += "File not found (powershell.exe or script path issue)."
-            elif ret == 3: error_message += "Path not found."
-            elif ret == 5: error_message += "Access denied (UAC prompt possibly denied or other permission issue)."
-            elif ret == 1223: error_message += "The operation was canceled by the user (UAC prompt denied or closed)." # Common UAC denial
-            else: error_message += "Refer to ShellExecuteW documentation for other error codes."
-
-            ctypes.windll.user32.MessageBoxW(None, error_message, "Launch Error", 0x10 | 0x0)
-            print(error_message)
+        if not shell_execute_ex(ctypes.byref(execute_info)):
+            error_code = ctypes.get_last_error()
+            error_message = (
+                f"ShellExecuteExW failed to start the script. Error code: {error_code}\n\n"
+                f"{SHELL_EXECUTE_ERRORS.get(error_code) or ctypes.FormatError(error_code)}"
+            )
+            show_error("Launch Error", error_message)
         else:
             success_message = (
-                f"Successfully requested to run '{TARGET_PS_SCRIPT_NAME}' as administrator.\n"
-                "If UAC is enabled, a prompt should appear.\n"
+                f"Successfully started '{TARGET_PS_SCRIPT_NAME}' as administrator.\n"
                 "The PowerShell script will run in a new window."
             )
             print(success_message)
+
+            if execute_info.hProcess:
+                kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+                kernel32.WaitForSingleObject.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+                kernel32.GetExitCodeProcess.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ulong)]
+                kernel32.CloseHandle.argtypes = [ctypes.c_void_p]
+                try:
+                    if wait:
+                        print("Waiting for the PowerShell script to finish...")
+                        kernel32.WaitForSingleObject(execute_info.hProcess, INFINITE)
+                        exit_code = ctypes.c_ulong()
+                        if kernel32.GetExitCodeProcess(execute_info.hProcess, ctypes.byref(exit_code)):
+                            print(f"The PowerShell script exited with code {exit_code.value}.")
+                finally:
+                    kernel32.CloseHandle(execute_info.hProcess)
             
     except Exception as e:
-        exception_message = f"An exception occurred while trying to use ShellExecuteW: {e}"
-        ctypes.windll.user32.MessageBoxW(None, exception_message, "Python Script Exception", 0x10 | 0x0)
-        print(exception_message)
+        exception_message = f"An exception occurred while trying to use ShellExecuteExW: {e}"
+        show_error("Python Script Exception", exception_message)
 
 if __name__ == "__main__":
-    run_script()
+    args = parse_arguments()
+    run_script(use_cache=not args.no_cache, wait=args.wait, auto=args.auto)
     print("\nThis Python script has finished its task of attempting to launch the PowerShell script.")
-    if sys.stdout.isatty(): 
+    if sys.stdout.isatty() and sys.stdin.isatty() and not args.auto: # No pause in unattended runs
         input("Press Enter to close this Python script window...")
\ No newline at end of file